@@ -12,6 +12,7 @@ from __future__ import division
 
 import os
 import click
+from importlib.util import find_spec
 import pandas as pd
 from biom import Table, load_table
 from sourcetracker._cli import cli
@@ -26,7 +27,7 @@ from sourcetracker._gibbs_defaults import (DESC_TBL, DESC_MAP, DESC_OUT,
                                            DESC_RAF2, DESC_RST, DESC_DRW,
                                            DESC_BRN, DESC_DLY, DESC_PFA,
                                            DESC_RPL, DESC_SNK, DESC_SRS,
-                                           DESC_SRS2, DESC_CAT)
+                                           DESC_SRS2, DESC_CAT, DESC_FMT)
 
 # import default values
 from sourcetracker._gibbs_defaults import (DEFAULT_ALPH1, DEFAULT_ALPH2,
@@ -34,7 +35,13 @@ from sourcetracker._gibbs_defaults import (DEFAULT_ALPH1, DEFAULT_ALPH2,
                                            DEFAULT_HUND, DEFAULT_THOUS,
                                            DEFAULT_FLS, DEFAULT_SNK,
                                            DEFAULT_SRS, DEFAULT_SRS2,
-                                           DEFAULT_CAT)
+                                           DEFAULT_CAT, DEFAULT_FMT)
+
+# Optional packages that pandas can use to write each binary output format.
+_FORMAT_ENGINES = {'parquet': ('pyarrow', 'fastparquet'),
+                   'feather': ('pyarrow',)}
+# Column names that feather output uses for the table indices.
+_FEATHER_RESERVED_IDS = {'index', 'sink', 'source'}
 
 
 @cli.command(name='gibbs')
@@ -115,6 +122,10 @@ from sourcetracker._gibbs_defaults import (DEFAULT_ALPH1, DEFAULT_ALPH2,
 @click.option('--source_category_column', required=False, default=DEFAULT_CAT,
               type=click.STRING, show_default=True,
               help=DESC_CAT)
+@click.option('--output_format', required=False, default=DEFAULT_FMT,
+              type=click.Choice(['tsv', 'parquet', 'feather']),
+              show_default=True,
+              help=DESC_FMT)
 def gibbs(table_fp: Table,
           mapping_fp: pd.DataFrame,
           output_dir: str,
@@ -134,19 +145,45 @@ def gibbs(table_fp: Table,
           source_sink_column: str,
           source_column_value: str,
           sink_column_value: str,
-          source_category_column: str):
+          source_category_column: str,
+          output_format: str):
     '''Gibb's sampler for Bayesian estimation of microbial sample sources.
 
     For details, see the project README file.
     '''
-    # Create results directory. Click has already checked if it exists, and
-    # failed if so.
-    os.mkdir(output_dir)
+    # Fail before doing any work if the requested output format can't be
+    # written.
+    engines = _FORMAT_ENGINES.get(output_format, ())
+    if engines and not any(find_spec(engine) for engine in engines):
+        raise click.BadParameter('Writing %s output requires %s to be '
+                                 'installed.' % (output_format,
+                                                 ' or '.join(engines)),
+                                 param_hint='--output_format')
+
+    # Refuse to write into an existing directory so that earlier results are
+    # not mixed in.
+    if os.path.exists(output_dir):
+        raise click.BadParameter('%s already exists.' % output_dir,
+                                 param_hint='--output_dir')
 
     # Load the metadata file and feature table.
-    sample_metadata = parse_sample_metadata(open(mapping_fp, 'U'))
+    sample_metadata = parse_sample_metadata(mapping_fp)
     feature_table = biom_to_df(load_table(table_fp))
 
+    # feather stores the index as ordinary columns named 'index', 'sink' and
+    # 'source', so ids with those names would collide with them.
+    if output_format == 'feather':
+        ids = feature_table.index.union(feature_table.columns)
+        clashes = sorted(_FEATHER_RESERVED_IDS.intersection(ids))
+        if clashes:
+            raise click.BadParameter('Sample and feature ids cannot be named '
+                                     '%s when writing feather output.' %
+                                     ', '.join(clashes),
+                                     param_hint='--output_format')
+
+    # Create results directory, along with any missing parents.
+    os.makedirs(output_dir)
+
     # run the gibbs sampler helper function (same used for q2)
     results = gibbs_helper(feature_table, sample_metadata, loo, jobs,
                            alpha1, alpha2, beta, source_rarefaction_depth,
@@ -159,18 +196,41 @@ def gibbs(table_fp: Table,
     if len(results) == 3:
         mpm, mps, fas = results
         # write the feature tables from fas
-        for sink, fa in zip(mpm.columns, fas):
-            fa.to_csv(os.path.join(output_dir, sink + '.feature_table.txt'),
-                      sep='\t')
+        if output_format == 'tsv':
+            for sink, fa in zip(mpm.columns, fas):
+                _write_table(fa, output_dir, sink + '.feature_table',
+                             output_format)
+        else:
+            # binary formats hold every sink in one table keyed by sink
+            fas_merged = pd.concat(dict(zip(mpm.columns, fas)),
+                                   names=['sink', 'source'])
+            _write_table(fas_merged, output_dir, 'feature_tables',
+                         output_format)
     else:
         # get the results (without fas)
         mpm, mps = results
 
     # Write results.
-    mpm.to_csv(os.path.join(output_dir, 'mixing_proportions.txt'), sep='\t')
-    mps.to_csv(os.path.join(output_dir, 'mixing_proportions_stds.txt'),
-               sep='\t')
+    _write_table(mpm, output_dir, 'mixing_proportions', output_format)
+    _write_table(mps, output_dir, 'mixing_proportions_stds', output_format)
 
-    # Plot contributions.
+    # Plot contributions. Figures are only ever written to disk here, so use
+    # the non-interactive Agg backend and release the figure once saved.
+    # pyplot is imported here so that CLI startup doesn't pay for it.
+    import matplotlib.pyplot as plt
+    plt.switch_backend('Agg')
     fig, ax = plot_heatmap(mpm.T)
     fig.savefig(os.path.join(output_dir, 'mixing_proportions.pdf'), dpi=300)
+    plt.close(fig)
+
+
+def _write_table(df, output_dir, name, output_format):
+    '''Write `df` to `output_dir` as `name` in the given `output_format`.'''
+    if output_format == 'tsv':
+        df.to_csv(os.path.join(output_dir, name + '.txt'), sep='\t')
+    elif output_format == 'parquet':
+        df.to_parquet(os.path.join(output_dir, name + '.parquet'))
+    else:
+        # feather cannot store an index, so keep the ids as columns
+        df.reset_index().to_feather(os.path.join(output_dir,
+                                                 name + '.feather'))
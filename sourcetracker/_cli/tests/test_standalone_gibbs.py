@@ -12,6 +12,9 @@ import os
 import unittest
 import tempfile
 import pandas as pd
+from biom import load_table
+from importlib.util import find_spec
+from unittest import mock
 from click.testing import CliRunner
 from sourcetracker._cli.gibbs import gibbs
 from numpy.testing import assert_allclose
@@ -163,6 +166,138 @@ class Test_standalone_gibbs(unittest.TestCase):
                                            exp_mp.columns],
                                 atol=.50)
 
+    @unittest.skipIf(find_spec('pyarrow') is None,
+                     'pyarrow is required for parquet and feather output')
+    def test_standalone_gibbs_output_format(self):
+        """Checks the parquet and feather outputs can be read back."""
+        crnt_dir = os.path.dirname(os.path.abspath(__file__))
+        tst_pth = os.path.join(crnt_dir, os.pardir, os.pardir, os.pardir)
+        tbl_pth = os.path.join(tst_pth, 'data/tiny-test/otu_table.biom')
+        mta_pth = os.path.join(tst_pth, 'data/tiny-test/map.txt')
+        exp_pth = os.path.join(crnt_dir, 'data', 'exp_example1',
+                               'mixing_proportions.txt')
+        exp_mp = pd.read_csv(exp_pth, sep='\t', index_col=0).T
+
+        for output_format in ['parquet', 'feather']:
+            with tempfile.TemporaryDirectory() as temp_dir_name:
+                res_pth = os.path.join(temp_dir_name, 'res')
+                runner = CliRunner()
+                result = runner.invoke(gibbs,
+                                       ['--table_fp', tbl_pth,
+                                        '--mapping_fp', mta_pth,
+                                        '--output_dir', res_pth,
+                                        '--restarts', 2,
+                                        '--draws_per_restart', 3,
+                                        '--burnin', 10,
+                                        '--delay', 2,
+                                        '--per_sink_feature_assignments',
+                                        '--output_format', output_format])
+                self.assertEqual(result.exit_code, 0)
+
+                def res_fp(name):
+                    return os.path.join(res_pth,
+                                        name + '.' + output_format)
+                if output_format == 'parquet':
+                    res_mp = pd.read_parquet(res_fp('mixing_proportions'))
+                    res_ft = pd.read_parquet(res_fp('feature_tables'))
+                else:
+                    # feather keeps the index as leading columns
+                    res_mp = pd.read_feather(res_fp('mixing_proportions'))
+                    res_mp = res_mp.set_index(res_mp.columns[0])
+                    res_ft = pd.read_feather(res_fp('feature_tables'))
+                    res_ft = res_ft.set_index(['sink', 'source'])
+                self.assertTrue(os.path.exists(
+                    res_fp('mixing_proportions_stds')))
+
+                # check values
+                assert_allclose(exp_mp,
+                                res_mp.loc[exp_mp.index, exp_mp.columns],
+                                atol=.50)
+                # check one feature table per sink, keyed by sink
+                self.assertEqual(res_ft.index.names, ['sink', 'source'])
+                self.assertEqual(
+                    set(res_ft.index.get_level_values('sink')),
+                    set(res_mp.columns))
+
+    def test_standalone_gibbs_output_format_missing_engine(self):
+        """Checks a missing writer fails before any output is created."""
+        crnt_dir = os.path.dirname(os.path.abspath(__file__))
+        tst_pth = os.path.join(crnt_dir, os.pardir, os.pardir, os.pardir)
+        tbl_pth = os.path.join(tst_pth, 'data/tiny-test/otu_table.biom')
+        mta_pth = os.path.join(tst_pth, 'data/tiny-test/map.txt')
+
+        with tempfile.TemporaryDirectory() as temp_dir_name:
+            res_pth = os.path.join(temp_dir_name, 'res')
+            runner = CliRunner()
+            with mock.patch('sourcetracker._cli.gibbs.find_spec',
+                            return_value=None):
+                result = runner.invoke(gibbs,
+                                       ['--table_fp', tbl_pth,
+                                        '--mapping_fp', mta_pth,
+                                        '--output_dir', res_pth,
+                                        '--output_format', 'feather'])
+            self.assertNotEqual(result.exit_code, 0)
+            self.assertIn('--output_format', result.output)
+            self.assertFalse(os.path.exists(res_pth))
+
+    def test_standalone_gibbs_output_dir(self):
+        """Checks nested output directories are created and existing ones
+        are rejected."""
+        crnt_dir = os.path.dirname(os.path.abspath(__file__))
+        tst_pth = os.path.join(crnt_dir, os.pardir, os.pardir, os.pardir)
+        tbl_pth = os.path.join(tst_pth, 'data/tiny-test/otu_table.biom')
+        mta_pth = os.path.join(tst_pth, 'data/tiny-test/map.txt')
+
+        with tempfile.TemporaryDirectory() as temp_dir_name:
+            res_pth = os.path.join(temp_dir_name, 'a', 'b', 'res')
+            runner = CliRunner()
+            result = runner.invoke(gibbs,
+                                   ['--table_fp', tbl_pth,
+                                    '--mapping_fp', mta_pth,
+                                    '--output_dir', res_pth,
+                                    '--restarts', 2,
+                                    '--draws_per_restart', 3,
+                                    '--burnin', 10,
+                                    '--delay', 2])
+            self.assertEqual(result.exit_code, 0)
+            self.assertTrue(os.path.exists(
+                os.path.join(res_pth, 'mixing_proportions.txt')))
+
+            # a second run into the same directory is refused
+            result = runner.invoke(gibbs,
+                                   ['--table_fp', tbl_pth,
+                                    '--mapping_fp', mta_pth,
+                                    '--output_dir', res_pth])
+            self.assertNotEqual(result.exit_code, 0)
+            self.assertIn('--output_dir', result.output)
+
+    @unittest.skipIf(find_spec('pyarrow') is None, 'pyarrow not installed')
+    def test_standalone_gibbs_feather_reserved_ids(self):
+        """Checks ids that clash with feather's index columns are rejected."""
+        crnt_dir = os.path.dirname(os.path.abspath(__file__))
+        tst_pth = os.path.join(crnt_dir, os.pardir, os.pardir, os.pardir)
+        tbl_pth = os.path.join(tst_pth, 'data/tiny-test/otu_table.biom')
+        mta_pth = os.path.join(tst_pth, 'data/tiny-test/map.txt')
+        table = load_table(tbl_pth)
+        feature_ids = table.ids(axis='observation')
+        table.update_ids({feature_ids[0]: 'sink'}, axis='observation',
+                         strict=False, inplace=True)
+
+        with tempfile.TemporaryDirectory() as temp_dir_name:
+            bad_tbl_pth = os.path.join(temp_dir_name, 'otu_table.biom')
+            with open(bad_tbl_pth, 'w') as f:
+                f.write(table.to_json('test'))
+            res_pth = os.path.join(temp_dir_name, 'res')
+            runner = CliRunner()
+            result = runner.invoke(gibbs,
+                                   ['--table_fp', bad_tbl_pth,
+                                    '--mapping_fp', mta_pth,
+                                    '--output_dir', res_pth,
+                                    '--output_format', 'feather'])
+            self.assertNotEqual(result.exit_code, 0)
+            self.assertIn('sink', result.output)
+            self.assertFalse(os.path.exists(res_pth))
+
 
 if __name__ == "__main__":
     unittest.main()
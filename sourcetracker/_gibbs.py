@@ -76,15 +76,15 @@ def gibbs(feature_table: Table,
     else:
         columns_ = ['Sink', 'Source']
     # make the index map and mapping in the same step
-    ss_map = {'sample%i' % i: list(map(str, v))
-              for i, v in enumerate(fas_merged.index.tolist())}
-    ss_map = pd.DataFrame(ss_map, columns_).T
-    ss_map.index.name = 'sampleid'
+    ss_index = pd.Index(['sample%i' % i for i in range(len(fas_merged))],
+                        name='sampleid')
+    ss_map = pd.DataFrame([list(map(str, v)) for v in fas_merged.index],
+                          index=ss_index, columns=columns_, dtype=object)
     # output for QIIME2
     fas_merged.index = ss_map.index
-    fas_merged = Table(fas_merged.T.values,
-                       fas_merged.T.index,
-                       fas_merged.T.columns)
+    fas_merged = Table(fas_merged.values.T,
+                       fas_merged.columns,
+                       fas_merged.index)
     # this is because QIIME will only
     # support these for now
     # in the future we will work
@@ -150,10 +150,11 @@ def gibbs_helper(feature_table: Table,
 
     # Rarify collapsed source data if requested.
     if source_rarefaction_depth > 0:
-        d = (csources.sum(1) >= source_rarefaction_depth)
+        depths = csources.sum(1)
+        d = (depths >= source_rarefaction_depth)
         if not d.all():
             count_too_shallow = (~d).sum()
-            shallowest = csources.sum(1).min()
+            shallowest = depths.min()
             raise ValueError(('You requested rarefaction of source samples at '
                               '%s, but there are %s collapsed source samples '
                               'that have less sequences than that. The '
@@ -169,10 +170,11 @@ def gibbs_helper(feature_table: Table,
     if not loo:
         sinks = feature_table.loc[sink_samples, :]
         if sink_rarefaction_depth > 0:
-            d = (sinks.sum(1) >= sink_rarefaction_depth)
+            depths = sinks.sum(1)
+            d = (depths >= sink_rarefaction_depth)
             if not d.all():
                 count_too_shallow = (~d).sum()
-                shallowest = sinks.sum(1).min()
+                shallowest = depths.min()
                 raise ValueError(('You requested rarefaction of sink samples '
                                   'at %s, but there are %s sink samples that '
                                   'have less sequences than that. The '
@@ -12,6 +12,7 @@ DEFAULT_SNK = 'SourceSink'
 DEFAULT_SRS = 'source'
 DEFAULT_SRS2 = 'sink'
 DEFAULT_CAT = 'Env'
+DEFAULT_FMT = 'tsv'
 
 DESC_TBL = 'Path to input table.'
 DESC_MAP = 'Path to sample metadata mapping file.'
@@ -72,6 +73,12 @@ DESC_SRS2 = ('Value in source_sink_column indicating which samples '
              'should be treated as sinks.')
 DESC_CAT = ('Sample metadata column indicating the type of each '
             'source sample.')
+DESC_FMT = ('File format of the output tables. `tsv` writes tab-separated '
+            'text files. `parquet` and `feather` write binary columnar '
+            'files (these require pyarrow, or fastparquet for `parquet`), '
+            'and combine the per-sink feature tables into a single '
+            '`feature_tables` file. With `feather`, no sample or feature id '
+            'may be named `index`, `sink` or `source`.')
 OUT_MEAN = ('The mixing_proporitions output is a table with sinks'
             ' as rows and sources as columns. The values in the '
             'table are the mean fractional contributions of each '
@@ -8,18 +8,28 @@
 # The full license is in the file LICENSE, distributed with this software.
 # ----------------------------------------------------------------------------
 
-import seaborn as sns
-import matplotlib.pyplot as plt
+# Heatmaps with more cells than this are drawn without per-cell annotations
+# and with rasterized cells. Every annotation is a separate text artist and
+# every cell a separate path in vector output, so on large matrices they
+# dominate rendering time and file size (and labels are unreadable anyway).
+_MAX_VECTOR_CELLS = 2500
 
 
-def plot_heatmap(mpm, cm=plt.cm.viridis, xlabel='Sources', ylabel='Sinks',
+def plot_heatmap(mpm, cm='viridis', xlabel='Sources', ylabel='Sinks',
                  title='Mixing Proportions (as Fraction)'):
     '''Make a basic mixing proportion histogram.'''
+    # pyplot and seaborn are slow to import and only needed here, so defer
+    # them until a plot is actually requested.
+    import matplotlib.pyplot as plt
+    import seaborn as sns
+
     fig = plt.figure()
     ax = fig.add_subplot(1, 1, 1)
-    sns.heatmap(mpm, vmin=0, vmax=1.0, cmap=cm, annot=True, linewidths=.5,
-                ax=ax)
-    ax.set_xlabel(xlabel)
-    ax.set_ylabel(ylabel)
-    ax.set_title(title)
+    large = mpm.size > _MAX_VECTOR_CELLS
+    sns.heatmap(mpm, vmin=0, vmax=1.0, cmap=cm, annot=not large,
+                linewidths=.5, ax=ax)
+    if large:
+        # rasterize the cell mesh only; ticks and labels stay vector
+        ax.collections[0].set_rasterized(True)
+    ax.set(xlabel=xlabel, ylabel=ylabel, title=title)
     return fig, ax
@@ -59,7 +59,10 @@ def validate_gibbs_input(sources, sinks=None):
         # we can't use e.g. np.isreal(df.dtypes).all(). Instead we use
         # applymap. Based on:
         # http://stackoverflow.com/questions/21771133/finding-non-numeric-rows-in-dataframe-in-pandas
-        if not df.applymap(np.isreal).values.all():
+        # Columns with a bool, int or float dtype are real by construction,
+        # so only the remaining columns are checked element by element.
+        unchecked = df.loc[:, [dt.kind not in 'biuf' for dt in df.dtypes]]
+        if not unchecked.applymap(np.isreal).values.all():
             raise ValueError('A dataframe contains one or more values which '
                              'are not numeric. Data must be exclusively '
                              'positive integers.')
@@ -838,6 +841,10 @@ def cumulative_proportions(all_envcounts, sink_ids, source_ids):
     function does _not_ check that the assumptions of ordering described above
     are met. It is the user's responsibility to check these if using this
     function independently.
+
+    All tables in `all_envcounts` must have the same shape (as they do when
+    produced by `gibbs_sampler` with fixed `restarts` and
+    `draws_per_restart`), so that they can be stacked and reduced together.
     '''
     num_sinks = len(sink_ids)
     num_sources = len(source_ids) + 1
@@ -845,9 +852,15 @@ def cumulative_proportions(all_envcounts, sink_ids, source_ids):
     proportions = np.zeros((num_sinks, num_sources), dtype=np.float64)
     proportions_std = np.zeros((num_sinks, num_sources), dtype=np.float64)
 
-    for i, envcounts in enumerate(all_envcounts):
-        proportions[i] = envcounts.sum(0) / envcounts.sum()
-        proportions_std[i] = (envcounts / envcounts.sum()).std(0)
+    if num_sinks > 0:
+        # Stack to a (sinks, draws, sources) array and reduce every sink at
+        # once rather than looping over sinks in Python.
+        envcounts = np.stack(all_envcounts)
+        totals = envcounts.sum(axis=(1, 2), keepdims=True)
+        proportions[:] = envcounts.sum(1) / totals[:, 0]
+        # `totals` is constant per sink, so scale the std of the raw counts
+        # rather than materializing every count as a float fraction first.
+        proportions_std[:] = envcounts.std(1) / totals[:, 0]
 
     cols = list(source_ids) + ['Unknown']
     return (pd.DataFrame(proportions, index=sink_ids, columns=cols),
@@ -881,6 +894,12 @@ def single_sink_feature_table(final_env_assignments, final_taxon_assignments,
         A dataframe containing counts of features contributed to the sink by
         each source.
 
+    Raises
+    ------
+    ValueError
+        If `final_env_assignments` and `final_taxon_assignments` do not have
+        the same shape.
+
     Notes
     -----
     This script is designed to be used by `collate_gibbs_results` after
@@ -888,13 +907,25 @@ def single_sink_feature_table(final_env_assignments, final_taxon_assignments,
     function does _not_ check that the assumptions of ordering described above
     are met. It is the user's responsibility to check these if using this
     function independently.
+
+    The counts are accumulated in a temporary intp array of flattened cell
+    indices, the same size as the assignment arrays, before being cast to
+    int32. Peak memory is therefore a few times that of the inputs.
     '''
+    if final_env_assignments.shape != final_taxon_assignments.shape:
+        raise ValueError('Environment and taxon assignments must have the '
+                         'same shape, but have shapes %s and %s.' %
+                         (final_env_assignments.shape,
+                          final_taxon_assignments.shape))
     num_sources = len(source_ids) + 1
     num_features = len(feature_ids)
-    data = np.zeros((num_sources, num_features), dtype=np.int32)
-    for r, c in zip(final_env_assignments.ravel(),
-                    final_taxon_assignments.ravel()):
-        data[r, c] += 1
+    # Count every (source, feature) cell in a single pass over the flattened
+    # cell indices. The indices are widened to intp first so the product
+    # cannot overflow for large int32 assignment arrays.
+    cells = (final_env_assignments.ravel().astype(np.intp) * num_features +
+             final_taxon_assignments.ravel())
+    data = np.bincount(cells, minlength=num_sources * num_features)
+    data = data.reshape(num_sources, num_features).astype(np.int32)
     return pd.DataFrame(data, index=list(source_ids) + ['Unknown'],
                         columns=feature_ids)
 
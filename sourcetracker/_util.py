@@ -16,8 +16,8 @@ def parse_sample_metadata(f):
 
     Parameters
     ----------
-    f : file handle
-        The sample metadata to be parsed.
+    f : str or file handle
+        Path to, or file handle of, the sample metadata to be parsed.
 
     Returns
     -------
@@ -45,6 +45,6 @@ def biom_to_df(biom_table):
     feature_table : pd.DataFrame
         Contingency table with rows, columns = samples, features.
     '''
-    return pd.DataFrame(biom_table._data.toarray().T,
+    return pd.DataFrame(biom_table.matrix_data.toarray().T,
                         index=biom_table.ids(axis='sample'),
                         columns=biom_table.ids(axis='observation'))
@@ -484,6 +484,24 @@ class TestDataAggregationFunctions(TestCase):
         pd.util.testing.assert_frame_equal(obs_prp, exp_prp)
         pd.util.testing.assert_frame_equal(obs_prp_std, exp_prp_std)
 
+        # Larger random input, checked against a per-sink computation.
+        rng = np.random.RandomState(0)
+        all_envcounts = [rng.randint(0, 1000, size=(50, 8)) for _ in
+                         range(20)]
+        sink_ids = np.array(['sink%s' % i for i in range(20)])
+        source_ids = np.array(['source%s' % i for i in range(7)])
+        cols = list(source_ids) + ['Unknown']
+        exp_prp = pd.DataFrame([ec.sum(0) / ec.sum() for ec in
+                                all_envcounts],
+                               index=sink_ids, columns=cols)
+        exp_prp_std = pd.DataFrame([(ec / ec.sum()).std(0) for ec in
+                                    all_envcounts],
+                                   index=sink_ids, columns=cols)
+        obs_prp, obs_prp_std = cumulative_proportions(all_envcounts, sink_ids,
+                                                      source_ids)
+        pd.util.testing.assert_frame_equal(obs_prp, exp_prp)
+        pd.util.testing.assert_frame_equal(obs_prp_std, exp_prp_std)
+
     def test_single_sink_feature_table(self):
         # 4 draws, depth of sink = 10, 5 sources + Unknown.
         final_env_assignments = np.array([[5, 0, 0, 0, 2, 0, 1, 0, 3, 1],
@@ -494,7 +512,6 @@ class TestDataAggregationFunctions(TestCase):
         # `generate_taxon_sequence` before the `gibbs_sampler` runs.
         final_taxon_assignments = \
             np.array([[0, 3, 3, 227, 550, 550, 550, 999, 999, 1100],
-                      [0, 3, 3, 227, 550, 550, 550, 999, 999, 1100],
                       [0, 3, 3, 227, 550, 550, 550, 999, 999, 1100],
                       [0, 3, 3, 227, 550, 550, 550, 999, 999, 1100],
                       [0, 3, 3, 227, 550, 550, 550, 999, 999, 1100]])
@@ -534,6 +551,12 @@ class TestDataAggregationFunctions(TestCase):
 
         pd.util.testing.assert_frame_equal(obs, exp)
 
+        # Mismatched assignment shapes are an error.
+        with self.assertRaises(ValueError):
+            single_sink_feature_table(final_env_assignments,
+                                      final_taxon_assignments[:-1],
+                                      source_ids, feature_ids)
+
     def test_collate_gibbs_results(self):
         # We'll vary the depth of the sinks - simulating a situation where the
         # user has not rarefied.
@@ -552,7 +575,6 @@ class TestDataAggregationFunctions(TestCase):
                       [2, 1, 0, 5, 5, 5, 5, 1, 0, 2]])
         final_taxon_assignments_sink1 = \
             np.array([[0, 3, 3, 227, 550, 550, 550, 999, 999, 1100],
-                      [0, 3, 3, 227, 550, 550, 550, 999, 999, 1100],
                       [0, 3, 3, 227, 550, 550, 550, 999, 999, 1100],
                       [0, 3, 3, 227, 550, 550, 550, 999, 999, 1100],
                       [0, 3, 3, 227, 550, 550, 550, 999, 999, 1100]])
@@ -567,10 +589,14 @@ class TestDataAggregationFunctions(TestCase):
                       [0, 2, 3, 2, 0, 0, 2, 4, 5, 4, 0, 5, 3, 1, 4],
                       [4, 3, 2, 1, 2, 5, 3, 5, 2, 0, 1, 0, 5, 1, 5]])
         final_taxon_assignments_sink2 = \
-            np.array([[7, 7, 7, 7, 8, 8, 8, 8, 250, 250, 250, 250, 1249, 1249],
-                      [7, 7, 7, 7, 8, 8, 8, 8, 250, 250, 250, 250, 1249, 1249],
-                      [7, 7, 7, 7, 8, 8, 8, 8, 250, 250, 250, 250, 1249, 1249],
-                     [7, 7, 7, 7, 8, 8, 8, 8, 250, 250, 250, 250, 1249, 1249]])
+            np.array([[7, 7, 7, 7, 8, 8, 8, 8, 250, 250, 250, 250, 1249, 1249,
+                       1249],
+                      [7, 7, 7, 7, 8, 8, 8, 8, 250, 250, 250, 250, 1249, 1249,
+                       1249],
+                      [7, 7, 7, 7, 8, 8, 8, 8, 250, 250, 250, 250, 1249, 1249,
+                       1249],
+                      [7, 7, 7, 7, 8, 8, 8, 8, 250, 250, 250, 250, 1249, 1249,
+                       1249]])
 
         final_env_counts_sink3 = np.array([[4, 2, 0, 0, 1, 0],
                                            [0, 3, 1, 0, 2, 1],
@@ -1255,6 +1281,21 @@ class PlotHeatmapTests(TestCase):
                                xlabel='Other 1', ylabel='Other 2',
                                title='Other 3')
 
+    def test_large_heatmap(self):
+        # small heatmaps are annotated and keep vector cells
+        fig, ax = plot_heatmap(self.mpm)
+        self.assertGreater(len(ax.texts), 0)
+        self.assertFalse(ax.collections[0].get_rasterized())
+        plt.close(fig)
+
+        # large heatmaps skip the annotations and rasterize the cell mesh
+        prng = np.random.RandomState(0)
+        mpm = pd.DataFrame(prng.uniform(size=(60, 60)))
+        fig, ax = plot_heatmap(mpm)
+        self.assertEqual(len(ax.texts), 0)
+        self.assertTrue(ax.collections[0].get_rasterized())
+        plt.close(fig)
+
 
 if __name__ == '__main__':
     main()